@@ -0,0 +1,124 @@
+# Конкурентный бенчмарк POST /checkout: много покупателей одновременно разбирают
+# несколько "горячих" товаров с маленьким остатком. Проверяет, что ничего не продано
+# сверх остатка, и печатает пропускную способность в JSON. Каждый покупатель отправляет
+# --submits одновременных заказов одной корзины (двойной клик): заказ должен выйти один.
+#
+#   python -m benchmarks.checkout --buyers 500 --products 5 --stock 40
+#   python -m benchmarks.checkout --submits 8
+#   DB_MODE=async python -m benchmarks.checkout --database-url sqlite:///./bench.db
+import argparse
+import asyncio
+import random
+import secrets
+import sys
+import time
+
+from benchmarks.common import add_database_url, in_session, run_benchmark
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Concurrent checkout benchmark")
+    add_database_url(parser)
+    parser.add_argument("--buyers", type=int, default=300)
+    parser.add_argument("--products", type=int, default=5)
+    parser.add_argument("--stock", type=int, default=40, help="initial stock of every product")
+    parser.add_argument("--max-quantity", type=int, default=3)
+    parser.add_argument("--submits", type=int, default=2, help="concurrent checkouts of the same cart per buyer")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    return parser.parse_args()
+
+async def run(args):
+    import httpx
+    import main
+
+    rng = random.Random(args.seed)
+    async with main.app.router.lifespan_context(main.app):
+        # Данные заводятся напрямую через ORM, в замер попадает только оформление заказа
+        def seed(db):
+            db.add_all(main.Product(name=f"hot-{i}", price=10.0, description="", stock=args.stock)
+                       for i in range(args.products))
+            db.add_all(main.User(username=f"buyer-{i}", password="-") for i in range(args.buyers))
+            db.flush()
+            product_ids = list(db.scalars(main.select(main.Product.id)))
+            user_ids = list(db.scalars(main.select(main.User.id)))
+            carts = [
+                {"user_id": user_id, "product_id": product_id, "quantity": rng.randint(1, args.max_quantity)}
+                for user_id in user_ids
+                for product_id in rng.sample(product_ids, rng.randint(1, min(2, len(product_ids))))
+            ]
+            db.execute(main.insert(main.CartItem), carts)
+            db.commit()
+            return product_ids, user_ids, len(carts)
+
+        product_ids, user_ids, cart_items = await in_session(main, seed)
+
+        tokens = []
+        for user_id in user_ids:
+            token = secrets.token_urlsafe(main.TOKEN_BYTES)
+            await main.sessions.set(token, user_id)
+            tokens.append(token)
+
+        transport = httpx.ASGITransport(app=main.app)
+        limit = asyncio.Semaphore(args.concurrency)
+        statuses = {}
+        latencies = []
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def buy(token):
+                async with limit:
+                    start = time.perf_counter()
+                    response = await client.post("/checkout", headers={"Authorization": f"Bearer {token}"})
+                    latencies.append(time.perf_counter() - start)
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(buy(token) for token in tokens for _ in range(args.submits)))
+            elapsed = time.perf_counter() - started
+
+        def verify(db):
+            stock = dict(db.execute(main.select(main.Product.id, main.Product.stock)).all())
+            sold = dict(db.execute(
+                main.select(main.OrderItem.product_id, main.func.sum(main.OrderItem.quantity))
+                .group_by(main.OrderItem.product_id)
+            ).all())
+            orders = db.scalar(main.select(main.func.count()).select_from(main.Order))
+            repeated = db.scalar(main.select(main.func.count()).select_from(
+                main.select(main.Order.user_id).group_by(main.Order.user_id).having(main.func.count() > 1).subquery()
+            ))
+            # Каждая позиция корзины либо попала в заказ, либо осталась в корзине
+            ordered = db.scalar(main.select(main.func.count()).select_from(main.OrderItem))
+            left = db.scalar(main.select(main.func.count()).select_from(main.CartItem))
+            return stock, sold, orders, repeated, ordered + left
+
+        stock, sold, orders, repeated, accounted = await in_session(main, verify)
+
+    oversold = [pid for pid in product_ids if stock[pid] < 0 or stock[pid] + sold.get(pid, 0) != args.stock]
+    latencies.sort()
+    return {
+        "db_mode": main.DB_MODE,
+        "database": main.sync_engine.dialect.name,
+        "buyers": args.buyers,
+        "products": args.products,
+        "initial_stock": args.stock,
+        "submits_per_buyer": args.submits,
+        "concurrency": args.concurrency,
+        "elapsed_seconds": round(elapsed, 4),
+        "checkouts_per_second": round(args.buyers * args.submits / elapsed, 1),
+        "latency_ms": {
+            "p50": round(latencies[len(latencies) // 2] * 1000, 2),
+            "p99": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 2),
+        },
+        "statuses": {str(code): n for code, n in sorted(statuses.items())},
+        "orders": orders,
+        "buyers_with_repeated_orders": repeated,
+        "sold": {str(pid): sold.get(pid, 0) for pid in product_ids},
+        "remaining_stock": {str(pid): stock[pid] for pid in product_ids},
+        "consistent": not oversold and not repeated and accounted == cart_items and orders == statuses.get(200, 0),
+    }
+
+def cli():
+    result = run_benchmark("checkout", run, parse_args())
+    sys.exit(0 if result["consistent"] else 1)
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,43 @@
+# Общее для бенчмарков: чистая база под замер, запуск из командной строки с JSON-отчётом
+# и работа с БД в обоих режимах DB_MODE
+import asyncio
+import inspect
+import json
+import os
+import sys
+import tempfile
+
+def add_database_url(parser):
+    parser.add_argument("--database-url", help="scratch database, defaults to a fresh SQLite file in a temp dir")
+
+def run_benchmark(name: str, run, args, db_mode: str | None = None) -> dict:
+    # DATABASE_URL из окружения намеренно не используется: бенчмарк пишет в базу.
+    # main читает настройки при импорте, поэтому он импортируется только после них
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/{name}.db"
+    if db_mode:
+        os.environ["DB_MODE"] = db_mode
+    import main
+    import migrate
+
+    # Схему приложение само не создаёт
+    migrate.upgrade(main.DATABASE_URL)
+    result = run(args)
+    if inspect.iscoroutine(result):
+        result = asyncio.run(result)
+    json.dump(result, sys.stdout, indent=2)
+    print()
+    return result
+
+async def in_session(main, fn):
+    if main.DB_MODE == "async":
+        async with main.SessionLocal() as db:
+            return await main.run_db(db, fn)
+    with main.SessionLocal() as db:
+        return await main.run_db(db, fn)
+
+def percentiles(samples: list[float]) -> dict:
+    samples = sorted(samples)
+    if not samples:
+        return {}
+    pick = lambda q: round(samples[min(len(samples) - 1, int(len(samples) * q))] * 1000, 2)
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(samples[-1] * 1000, 2)}
@@ -0,0 +1,96 @@
+# Бенчмарк POST /login с включённым scrypt: пропускная способность входов при
+# конкурентной нагрузке и задержка event loop и лёгкого запроса, идущего в это же время.
+# С --hash-workers 0 хэш считается прямо в event loop — для сравнения.
+#
+#   python -m benchmarks.login --logins 200 --concurrency 50
+#   python -m benchmarks.login --hash-workers 0
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.common import add_database_url, in_session, percentiles, run_benchmark
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Concurrent login benchmark with password hashing")
+    add_database_url(parser)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--hash-workers", type=int, help="defaults to PASSWORD_HASH_WORKERS")
+    parser.add_argument("--probe-interval", type=float, default=0.01, help="seconds between probe requests")
+    return parser.parse_args()
+
+async def run(args):
+    import httpx
+    import main
+    from passwords import hash_password
+
+    async with main.app.router.lifespan_context(main.app):
+        # У всех пользователей один пароль: стоимость проверки от этого не меняется
+        stored = hash_password("password", main.PASSWORD_SCRYPT_N, main.PASSWORD_SCRYPT_R, main.PASSWORD_SCRYPT_P)
+
+        def seed(db):
+            db.add_all(main.User(username=f"user-{i}", password=stored) for i in range(args.users))
+            db.commit()
+
+        await in_session(main, seed)
+
+        transport = httpx.ASGITransport(app=main.app)
+        limit = asyncio.Semaphore(args.concurrency)
+        logins, probes, lags, statuses = [], [], [], {}
+        done = asyncio.Event()
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def login(i):
+                async with limit:
+                    start = time.perf_counter()
+                    response = await client.post(
+                        "/login", json={"username": f"user-{i % args.users}", "password": "password"}
+                    )
+                    logins.append(time.perf_counter() - start)
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+            async def probe():
+                # Опоздание пробуждения после sleep — задержка event loop; запрос без БД
+                # и хэширования показывает, сколько ждёт обычный клиент в это время
+                while not done.is_set():
+                    start = time.perf_counter()
+                    await asyncio.sleep(args.probe_interval)
+                    woke = time.perf_counter()
+                    lags.append(woke - start - args.probe_interval)
+                    await client.get("/metrics/db-pool")
+                    probes.append(time.perf_counter() - woke)
+
+            # Прогрев пула процессов, чтобы в замер не попал их запуск
+            await main.password_hasher.verify("password", stored)
+            prober = asyncio.create_task(probe())
+            started = time.perf_counter()
+            await asyncio.gather(*(login(i) for i in range(args.logins)))
+            elapsed = time.perf_counter() - started
+            done.set()
+            await prober
+
+    return {
+        "db_mode": main.DB_MODE,
+        "hash_workers": main.password_hasher.workers,
+        "scrypt": {"n": main.PASSWORD_SCRYPT_N, "r": main.PASSWORD_SCRYPT_R, "p": main.PASSWORD_SCRYPT_P},
+        "logins": args.logins,
+        "concurrency": args.concurrency,
+        "elapsed_seconds": round(elapsed, 4),
+        "logins_per_second": round(args.logins / elapsed, 1),
+        "login_latency_ms": percentiles(logins),
+        "event_loop_lag_ms": percentiles(lags),
+        "probe_latency_ms": percentiles(probes),
+        "probes": len(probes),
+        "statuses": {str(code): n for code, n in sorted(statuses.items())},
+    }
+
+def cli():
+    args = parse_args()
+    if args.hash_workers is not None:
+        os.environ["PASSWORD_HASH_WORKERS"] = str(args.hash_workers)
+    run_benchmark("login", run, args)
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,74 @@
+# Память на выборку N товаров (tracemalloc): полные ORM-объекты Product против
+# колоночного SELECT из PRODUCT_COLUMNS, которым теперь читают все эндпоинты товаров.
+# retained — что остаётся занятым, пока результат жив (страница до сериализации),
+# peak — максимум во время выборки; blocks — число выделенных объектов.
+#
+#   python -m benchmarks.memory --products 10000
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.common import add_database_url, run_benchmark
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Memory per row: ORM entities vs column-only rows")
+    add_database_url(parser)
+    parser.add_argument("--products", type=int, default=10_000)
+    return parser.parse_args()
+
+def measure(main, fetch, n: int) -> dict:
+    with main.SessionLocal() as db:
+        # Прогрев: кэш компиляции запроса и ленивые импорты не должны попасть в замер
+        fetch(db)
+        db.expunge_all()
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        result = fetch(db)
+        current, peak = tracemalloc.get_traced_memory()
+        retained = tracemalloc.take_snapshot().compare_to(before, "filename")
+        tracemalloc.stop()
+        assert len(result) == n
+        size = sum(stat.size_diff for stat in retained)
+        blocks = sum(stat.count_diff for stat in retained)
+    return {
+        "retained_bytes": size,
+        "peak_bytes": peak,
+        "blocks": blocks,
+        "retained_bytes_per_row": round(size / n, 1),
+        "blocks_per_row": round(blocks / n, 2),
+    }
+
+def run(args):
+    import main
+
+    with main.sync_engine.begin() as conn:
+        conn.execute(main.insert(main.Product), [
+            {"name": f"product {i}", "price": round(1 + i * 0.37, 2), "description": f"description of product {i}",
+             "stock": i % 50}
+            for i in range(args.products)
+        ])
+
+    order = main.Product.id
+    results = {
+        "orm_entities": measure(main, lambda db: db.scalars(main.select(main.Product).order_by(order)).all(), args.products),
+        "column_rows": measure(
+            main, lambda db: db.execute(main.select(*main.PRODUCT_COLUMNS).order_by(order)).all(), args.products
+        ),
+    }
+    orm, rows = results["orm_entities"], results["column_rows"]
+    main.sync_engine.dispose()
+    return {
+        "database": main.sync_engine.dialect.name,
+        "products": args.products,
+        "variants": results,
+        "retained_ratio": round(orm["retained_bytes"] / rows["retained_bytes"], 2),
+        "blocks_ratio": round(orm["blocks"] / rows["blocks"], 2),
+    }
+
+def cli():
+    # Замер синхронный, поэтому и режим синхронный
+    run_benchmark("memory", run, parse_args(), db_mode="sync")
+
+if __name__ == "__main__":
+    cli()
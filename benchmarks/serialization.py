@@ -0,0 +1,94 @@
+# Стоимость выдачи списка товаров: процессорное время на выборку и сериализацию N товаров
+# тремя способами, которыми отвечают списочные эндпоинты:
+#   orm_response_model — ORM-объекты через response_model и stdlib json (обычный путь FastAPI),
+#   orm_type_adapter   — ORM-объекты через TypeAdapter(List[ProductOut]).dump_json (GET /products/),
+#   columns_orjson     — колоночный SELECT сразу в orjson (FAST_JSON=1).
+#
+#   python -m benchmarks.serialization --products 10000 --repeat 7
+import argparse
+import json
+import statistics
+import time
+
+from benchmarks.common import add_database_url, run_benchmark
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="CPU cost of fetching and serializing product lists")
+    add_database_url(parser)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=7, help="runs per variant, the median is reported")
+    return parser.parse_args()
+
+def variants(main):
+    from fastapi.encoders import jsonable_encoder
+
+    stmt = main.select(main.Product).order_by(main.Product.id)
+
+    def orm_response_model(db):
+        products = db.scalars(stmt).all()
+        start = time.process_time()
+        # То же, что делает FastAPI с response_model: валидация, приведение к JSON-типам, json.dumps
+        content = jsonable_encoder(main.products_json.dump_python(
+            main.products_json.validate_python(products, from_attributes=True), mode="json"
+        ))
+        body = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+        return body, start
+
+    def orm_type_adapter(db):
+        products = db.scalars(stmt).all()
+        start = time.process_time()
+        return main.products_json.dump_json(main.products_json.validate_python(products, from_attributes=True)), start
+
+    def columns_orjson(db):
+        rows = db.execute(stmt.with_only_columns(*main.PRODUCT_COLUMNS)).all()
+        start = time.process_time()
+        return main.rows_json(rows), start
+
+    return {
+        "orm_response_model": orm_response_model,
+        "orm_type_adapter": orm_type_adapter,
+        "columns_orjson": columns_orjson,
+    }
+
+def measure(main, fn, repeat):
+    fetch, serialize, size = [], [], 0
+    for _ in range(repeat):
+        with main.SessionLocal() as db:
+            started = time.process_time()
+            body, serialize_started = fn(db)
+            finished = time.process_time()
+        fetch.append(serialize_started - started)
+        serialize.append(finished - serialize_started)
+        size = len(body)
+    return {
+        "fetch_cpu_ms": round(statistics.median(fetch) * 1000, 2),
+        "serialize_cpu_ms": round(statistics.median(serialize) * 1000, 2),
+        "total_cpu_ms": round(statistics.median(a + b for a, b in zip(fetch, serialize)) * 1000, 2),
+        "body_bytes": size,
+    }
+
+def run(args):
+    import main
+
+    with main.sync_engine.begin() as conn:
+        conn.execute(main.insert(main.Product), [
+            {"name": f"product {i}", "price": round(1 + i * 0.37, 2), "description": f"description of product {i}",
+             "stock": i % 50}
+            for i in range(args.products)
+        ])
+
+    results = {name: measure(main, fn, args.repeat) for name, fn in variants(main).items()}
+    baseline = results["orm_response_model"]["total_cpu_ms"]
+    per_10k = 10_000 / args.products
+    for result in results.values():
+        result["total_cpu_ms_per_10k"] = round(result["total_cpu_ms"] * per_10k, 2)
+        result["cpu_saved_ms_per_10k"] = round((baseline - result["total_cpu_ms"]) * per_10k, 2)
+    main.sync_engine.dispose()
+    return {"database": main.sync_engine.dialect.name, "products": args.products, "repeat": args.repeat, "variants": results}
+
+def cli():
+    # Замер синхронный, поэтому и режим синхронный
+    run_benchmark("serialization", run, parse_args(), db_mode="sync")
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,139 @@
+# Миграции схемы: файлы migrations/NNN_имя.sql (или NNN_имя.mysql.sql / NNN_имя.sqlite.sql
+# для конкретной СУБД) применяются по порядку номеров, применённые версии записываются
+# в таблицу schema_version. Приложение схему не создаёт — при SCHEMA_CHECK=1 только сверяет версию.
+#
+#   python migrate.py upgrade
+#   python migrate.py current
+#   python migrate.py stamp 4
+import argparse
+import re
+import sys
+from pathlib import Path
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, create_engine, delete, func, inspect, insert, select
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+MIGRATION_FILE = re.compile(r"^(\d+)_\w+?(?:\.(mysql|sqlite))?\.sql$")
+
+version_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    version_metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("applied_at", DateTime, nullable=False, server_default=func.now()),
+)
+
+def migration_files() -> dict[int, dict[str | None, Path]]:
+    files = {}
+    for path in MIGRATIONS_DIR.glob("*.sql"):
+        match = MIGRATION_FILE.match(path.name)
+        if match:
+            files.setdefault(int(match[1]), {})[match[2]] = path
+    return dict(sorted(files.items()))
+
+def migrations(dialect: str) -> dict[int, Path | None]:
+    # Вариант под СУБД важнее общего файла; номер, у которого есть только чужие варианты,
+    # для этой СУБД пустой, но всё равно записывается как применённый
+    return {version: variants.get(dialect, variants.get(None)) for version, variants in migration_files().items()}
+
+def head_version() -> int:
+    return max(migration_files(), default=0)
+
+def current_version(conn) -> int | None:
+    # None — база без schema_version (создана до появления миграций или пустая)
+    if not inspect(conn).has_table(schema_version.name):
+        return None
+    return conn.scalar(select(func.max(schema_version.c.version))) or 0
+
+def split_statements(script: str) -> list[str]:
+    # Хватает для наших файлов: оператор заканчивается ';' в конце строки, строки-комментарии отбрасываются
+    body = "\n".join(line for line in script.splitlines() if not line.lstrip().startswith("--"))
+    return [statement.strip() for statement in re.split(r";\s*$", body, flags=re.M) if statement.strip()]
+
+def apply(engine, version: int, path: Path | None):
+    script = path.read_text(encoding="utf-8") if path else ""
+    if engine.dialect.name == "sqlite":
+        # executescript понимает триггеры с ';' внутри тела; DDL в SQLite транзакционный,
+        # поэтому миграция вместе с записью версии либо применяется целиком, либо никак
+        raw = engine.raw_connection()
+        try:
+            raw.driver_connection.executescript(
+                f"BEGIN;\n{script}\nINSERT INTO schema_version (version) VALUES ({version});\nCOMMIT;"
+            )
+        except Exception:
+            raw.driver_connection.rollback()
+            raise
+        finally:
+            raw.close()
+    else:
+        # В MySQL DDL не откатывается: операторы выполняются по одному, версия пишется после последнего
+        with engine.begin() as conn:
+            for statement in split_statements(script):
+                conn.exec_driver_sql(statement)
+            conn.execute(insert(schema_version).values(version=version))
+
+def stamp(database_url: str, version: int):
+    engine = create_engine(database_url)
+    try:
+        version_metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(delete(schema_version).where(schema_version.c.version >= version))
+            conn.execute(insert(schema_version).values(version=version))
+    finally:
+        engine.dispose()
+
+def upgrade(database_url: str) -> list[int]:
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as conn:
+            current = current_version(conn)
+            fresh = not inspect(conn).has_table("users")
+        if current is None:
+            version_metadata.create_all(engine)
+            if fresh:
+                # Пустая база: схема целиком из моделей, без прогона истории
+                import main
+                main.Base.metadata.create_all(engine)
+                main.session_metadata.create_all(engine)
+                stamp(database_url, head_version())
+                return list(migration_files())
+            current = 0
+        applied = []
+        for version, path in migrations(engine.dialect.name).items():
+            if version > current:
+                apply(engine, version, path)
+                applied.append(version)
+        return applied
+    finally:
+        engine.dispose()
+
+def cli():
+    parser = argparse.ArgumentParser(description="Database schema migrations")
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("upgrade", help="apply pending migrations, or create the whole schema on an empty database")
+    commands.add_parser("current", help="print the applied schema version")
+    stamp_parser = commands.add_parser("stamp", help="record a version as applied without running migrations")
+    stamp_parser.add_argument("version", help="migration number or 'head'")
+    args = parser.parse_args()
+
+    if args.database_url:
+        database_url = args.database_url
+    else:
+        import main
+        database_url = main.DATABASE_URL
+
+    if args.command == "upgrade":
+        applied = upgrade(database_url)
+        print(f"Applied: {', '.join(map(str, applied))}" if applied else "Already at head")
+    elif args.command == "current":
+        engine = create_engine(database_url)
+        with engine.connect() as conn:
+            current = current_version(conn)
+        engine.dispose()
+        print(f"{'untracked' if current is None else current} (head {head_version()})")
+        sys.exit(0 if current == head_version() else 1)
+    else:
+        stamp(database_url, head_version() if args.version == "head" else int(args.version))
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,16 @@
+-- Количество товара в корзине вместо дублирующихся строк cart_items
+ALTER TABLE cart_items ADD COLUMN quantity INTEGER NOT NULL DEFAULT 1;
+
+UPDATE cart_items SET quantity = (
+    SELECT n FROM (
+        SELECT user_id, product_id, COUNT(*) AS n FROM cart_items GROUP BY user_id, product_id
+    ) AS counts
+    WHERE counts.user_id = cart_items.user_id AND counts.product_id = cart_items.product_id
+)
+WHERE user_id IS NOT NULL AND product_id IS NOT NULL;
+
+DELETE FROM cart_items WHERE id NOT IN (
+    SELECT id FROM (SELECT MIN(id) AS id FROM cart_items GROUP BY user_id, product_id) AS keep
+);
+
+CREATE UNIQUE INDEX uq_cart_items_user_product ON cart_items (user_id, product_id);
@@ -0,0 +1,3 @@
+-- Составной индекс для выборки закладок по user_id и удаления по (user_id, product_id).
+-- Для cart_items ту же роль играет uq_cart_items_user_product из 001
+CREATE INDEX ix_bookmarks_user_product ON bookmarks (user_id, product_id);
@@ -0,0 +1,2 @@
+-- Полнотекстовый индекс для GET /products/search
+ALTER TABLE products ADD FULLTEXT INDEX ft_products_name_description (name, description);
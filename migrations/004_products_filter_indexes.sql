@@ -0,0 +1,4 @@
+-- Индексы под фильтры и сортировки GET /products/: price, in_stock, name_prefix
+CREATE INDEX ix_products_price ON products (price);
+CREATE INDEX ix_products_stock ON products (stock);
+CREATE INDEX ix_products_name ON products (name);
@@ -0,0 +1,24 @@
+-- Заказы и их позиции для POST /checkout
+CREATE TABLE orders (
+    id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    total FLOAT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY (user_id) REFERENCES users (id)
+);
+
+CREATE INDEX ix_orders_user_id ON orders (user_id);
+
+CREATE TABLE order_items (
+    id INTEGER NOT NULL,
+    order_id INTEGER NOT NULL,
+    product_id INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    price FLOAT NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY (order_id) REFERENCES orders (id),
+    FOREIGN KEY (product_id) REFERENCES products (id)
+);
+
+CREATE INDEX ix_order_items_order_id ON order_items (order_id);
@@ -0,0 +1,9 @@
+-- Таблица SESSION_BACKEND=database. IF NOT EXISTS: раньше приложение создавало её само при первом запросе
+CREATE TABLE IF NOT EXISTS sessions (
+    "key" VARCHAR(255) NOT NULL,
+    user_id INTEGER NOT NULL,
+    expires_at FLOAT NOT NULL,
+    PRIMARY KEY ("key")
+);
+
+CREATE INDEX IF NOT EXISTS ix_sessions_expires_at ON sessions (expires_at);
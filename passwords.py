@@ -0,0 +1,76 @@
+# Хэширование паролей scrypt. Вычисление намеренно медленное, поэтому выполняется
+# в пуле процессов: воркеры приложения и event loop в это время обслуживают другие запросы.
+# Модуль импортируется в дочерних процессах пула и не тянет за собой приложение.
+import asyncio
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+
+SCHEME = "scrypt"
+SALT_BYTES = 16
+DIGEST_BYTES = 32
+
+def b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+def scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + 1024 * 1024, dklen=DIGEST_BYTES
+    )
+
+def hash_password(password: str, n: int, r: int, p: int) -> str:
+    # scrypt$N$r$p$соль$хэш — параметры хранятся вместе с хэшем и могут меняться со временем
+    salt = secrets.token_bytes(SALT_BYTES)
+    return "$".join([SCHEME, str(n), str(r), str(p), b64encode(salt), b64encode(scrypt(password, salt, n, r, p))])
+
+def verify_password(password: str, stored: str) -> bool:
+    if not stored.startswith(SCHEME + "$"):
+        # Пароли, сохранённые до перехода на scrypt, лежат открытым текстом
+        return hmac.compare_digest(password.encode(), stored.encode())
+    _, n, r, p, salt, digest = stored.split("$")
+    return hmac.compare_digest(scrypt(password, b64decode(salt), int(n), int(r), int(p)), b64decode(digest))
+
+class PasswordHasher:
+    def __init__(self, workers: int, n: int, r: int, p: int):
+        # workers=0 — считать прямо в event loop (только для сравнения в бенчмарке)
+        self.workers = workers
+        self.n, self.r, self.p = n, r, p
+        self.pool = None
+        # Хэш для несуществующих пользователей: время ответа на неверный логин не выдаёт, есть ли такой
+        self.dummy = None
+
+    def executor(self) -> ProcessPoolExecutor:
+        if self.pool is None:
+            # spawn, а не fork: у процесса приложения уже есть потоки (пул потоков, драйверы БД)
+            self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self.pool
+
+    async def run(self, fn, *args):
+        if self.workers == 0:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor(), fn, *args)
+
+    async def hash(self, password: str) -> str:
+        return await self.run(hash_password, password, self.n, self.r, self.p)
+
+    async def verify(self, password: str, stored: str | None) -> bool:
+        if stored is None:
+            if self.dummy is None:
+                self.dummy = await self.hash(secrets.token_urlsafe())
+            await self.run(verify_password, password, self.dummy)
+            return False
+        return await self.run(verify_password, password, stored)
+
+    def needs_rehash(self, stored: str) -> bool:
+        return not stored.startswith(f"{SCHEME}${self.n}${self.r}${self.p}$")
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
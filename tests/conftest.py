@@ -0,0 +1,52 @@
+# main.py читает настройки из окружения при импорте, поэтому каждый тест получает
+# свежий модуль со своей SQLite-базой в tmp_path и нужным DB_MODE
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+def load_main(monkeypatch, tmp_path, mode: str, session_backend: str = "memory"):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/shop.db")
+    monkeypatch.setenv("DB_MODE", mode)
+    monkeypatch.setenv("SESSION_BACKEND", session_backend)
+    monkeypatch.setenv("SESSION_SQLITE_URL", f"sqlite:///{tmp_path}/sessions.db")
+    # Хэш считается в процессе и дёшево: тестам не нужна стойкость scrypt
+    monkeypatch.setenv("PASSWORD_HASH_WORKERS", "0")
+    monkeypatch.setenv("PASSWORD_SCRYPT_N", "1024")
+    sys.modules.pop("main", None)
+    main = importlib.import_module("main")
+    import migrate
+    migrate.upgrade(main.DATABASE_URL)
+    return main
+
+@pytest.fixture(params=["sync", "async"])
+def main(request, monkeypatch, tmp_path):
+    module = load_main(monkeypatch, tmp_path, request.param)
+    yield module
+    sys.modules.pop("main", None)
+
+@pytest.fixture
+def sync_main(monkeypatch, tmp_path):
+    module = load_main(monkeypatch, tmp_path, "sync")
+    yield module
+    sys.modules.pop("main", None)
+
+@pytest.fixture
+def client(main):
+    with TestClient(main.app) as client:
+        yield client
+
+def login(client, username: str = "alice", password: str = "secret") -> dict:
+    assert client.post("/register", json={"username": username, "password": password}).status_code == 200
+    token = client.post("/login", json={"username": username, "password": password}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+def create_products(client, n: int, stock: int = 10) -> list[int]:
+    return [
+        client.post("/products/", json={"name": f"product {i}", "price": 1.5 + i, "description": "", "stock": stock}).json()["id"]
+        for i in range(n)
+    ]
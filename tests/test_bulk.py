@@ -0,0 +1,88 @@
+# Массовые POST/PATCH /products/bulk
+import asyncio
+import json
+
+import pytest
+
+from conftest import create_products
+
+def test_import_rejects_overlong_rows_one_by_one(client, main):
+    rows = [
+        {"name": "ok", "price": 1.0, "description": "", "stock": 1},
+        {"name": "x" * 256, "price": 1.0, "description": "", "stock": 1},
+        {"name": "ok too", "price": 2.0, "description": "y" * 256, "stock": 1},
+        {"name": "last", "price": 3.0, "description": "", "stock": 1},
+    ]
+    body = "".join(json.dumps(row) + "\n" for row in rows)
+    report = client.post("/products/bulk", content=body, headers={"Content-Type": "application/x-ndjson"}).json()
+    assert report["inserted"] == 2
+    assert [error["line"] for error in report["errors"]] == [2, 3]
+    assert [p["name"] for p in client.get("/products/").json()] == ["ok", "last"]
+
+def test_update_bumps_catalog_version_per_chunk(client, main, monkeypatch):
+    ids = create_products(client, 5)
+    for product_id in ids:
+        client.get(f"/products/{product_id}")
+    monkeypatch.setattr(main, "BULK_CHUNK_SIZE", 2)
+    version = main.catalog_cache.version
+
+    items = [{"id": 998, "stock": 1}, {"id": 999, "stock": 1}] + [{"id": product_id, "price": 42.0} for product_id in ids]
+    assert client.patch("/products/bulk", json={"items": items}).json() == {"updated": 5, "not_found": [998, 999]}
+    # Первая пачка — только отсутствующие id, версию поднимают три остальные
+    assert main.catalog_cache.version == version + 3
+    assert all(client.get(f"/products/{product_id}").json()["price"] == 42.0 for product_id in ids)
+
+class StreamedBody:
+    def __init__(self, parts: list[bytes]):
+        self.parts = parts
+
+    async def stream(self):
+        for part in self.parts:
+            yield part
+
+def body_lines(main, parts: list[bytes]) -> list:
+    async def collect():
+        return [line async for line in main.body_lines(StreamedBody(parts))]
+    return asyncio.run(collect())
+
+LONG = b"x" * (64 * 1024 + 10)
+
+@pytest.mark.parametrize("parts, expected", [
+    ([b"a\n" + LONG + b"\nb\n"], [b"a", None, b"b"]),
+    ([b"a\n" + LONG[:-5], LONG[-5:] + b"\nb\n"], [b"a", None, b"b"]),
+    ([b"a\n", LONG[:10], LONG[10:], b"\nb"], [b"a", None, b"b"]),
+    ([b"a\n" + LONG], [b"a", None]),
+])
+def test_body_lines_checks_every_line_whatever_the_chunking(sync_main, parts, expected):
+    # None — ошибка вместо слишком длинной строки, как бы тело ни было нарезано на куски
+    assert sync_main.BULK_MAX_LINE_BYTES < len(LONG)
+    lines = body_lines(sync_main, parts)
+    assert [line if isinstance(line, bytes) else None for line in lines] == expected
+
+def test_import_reports_overlong_lines_and_keeps_going(client, main, monkeypatch):
+    monkeypatch.setattr(main, "BULK_CHUNK_SIZE", 2)
+    row = lambda name: json.dumps({"name": name, "price": 1.0, "description": "", "stock": 1}) + "\n"
+    body = row("a") + row("b") + "x" * (main.BULK_MAX_LINE_BYTES + 10) + "\n" + row("c") + row("d")
+    response = client.post("/products/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+    report = response.json()
+    assert report["inserted"] == 4
+    assert report["errors"] == [{"line": 3, "error": f"Line longer than {main.BULK_MAX_LINE_BYTES} bytes"}]
+    assert [p["name"] for p in client.get("/products/").json()] == ["a", "b", "c", "d"]
+
+def test_csv_import_keeps_newlines_inside_quoted_fields(client, main):
+    body = (
+        "name,price,description,stock\r\n"
+        '"Lamp",2,"line one\nline two, with comma",1\n'
+        '"multi\nline",2,d,1\n'
+        "plain,3,,1\n"
+        '"never closed,4,d,1\n'
+        "lost,5,,1\n"
+    )
+    report = client.post("/products/bulk", content=body, headers={"Content-Type": "text/csv"}).json()
+    assert report["inserted"] == 3
+    assert report["errors"] == [{"line": 7, "error": "Unterminated quoted field"}]
+    products = client.get("/products/").json()
+    assert [(p["name"], p["description"]) for p in products] == [
+        ("Lamp", "line one\nline two, with comma"), ("multi\nline", "d"), ("plain", ""),
+    ]
@@ -0,0 +1,76 @@
+# Основные роуты в обоих режимах БД: sync (пул потоков) и async (aiosqlite)
+import pytest
+from fastapi.testclient import TestClient
+
+from conftest import create_products, load_main, login
+
+def test_catalog(client, main):
+    ids = create_products(client, 3)
+    page = client.get("/products/", params={"limit": 2})
+    assert page.status_code == 200
+    assert [p["id"] for p in page.json()] == ids[:2]
+    assert [p["id"] for p in client.get("/products/", params={"after_id": ids[1]}).json()] == ids[2:]
+    assert client.get(f"/products/{ids[0]}").json()["name"] == "product 0"
+    assert client.get("/products/999").status_code == 404
+
+    updated = client.put(f"/products/{ids[0]}", json={"price": 9.5})
+    assert updated.json()["price"] == 9.5
+    assert client.delete(f"/products/{ids[2]}").json() == {"ok": True}
+    assert len(client.get("/products/", params={"stream": True}).text.splitlines()) == 2
+
+def test_cart_bookmarks_checkout(client, main):
+    auth = login(client)
+    ids = create_products(client, 2, stock=5)
+
+    assert client.post(f"/cart/{ids[0]}", params={"quantity": 2}, headers=auth).status_code == 200
+    assert client.post(f"/cart/{ids[1]}", headers=auth).status_code == 200
+    assert [(p["id"], p["quantity"]) for p in client.get("/cart", headers=auth).json()] == [(ids[0], 2), (ids[1], 1)]
+
+    assert client.post(f"/bookmarks/{ids[1]}", headers=auth).status_code == 200
+    assert [p["id"] for p in client.get("/bookmarks", headers=auth).json()] == [ids[1]]
+    assert client.delete(f"/bookmarks/{ids[1]}", headers=auth).status_code == 200
+    assert client.get("/bookmarks", headers=auth).json() == []
+
+    assert client.post("/checkout", headers=auth).status_code == 200
+    assert client.get("/cart", headers=auth).json() == []
+    assert client.get(f"/products/{ids[0]}").json()["stock"] == 3
+
+def test_cart_adds_respect_stock(client, main):
+    auth = login(client)
+    empty, two = create_products(client, 2, stock=0)
+    client.put(f"/products/{two}", json={"stock": 2})
+    batch = lambda *ops: client.post("/cart/batch", headers=auth, json={"ops": [
+        {"op": op, "product_id": product_id} for op, product_id in ops
+    ]})
+
+    assert client.post(f"/cart/{empty}", headers=auth).status_code == 409
+    assert batch(("add", empty), ("add", empty)).status_code == 409
+    assert batch(("add", 999)).status_code == 404
+
+    # В корзине уже лежит одна штука: вторая помещается, третья — уже нет ни по одному пути
+    assert client.post(f"/cart/{two}", headers=auth).status_code == 200
+    assert batch(("add", two), ("add", two)).status_code == 409
+    assert client.post(f"/cart/{two}", params={"quantity": 2}, headers=auth).status_code == 409
+    assert batch(("add", two)).status_code == 200
+    assert client.post(f"/cart/{two}", headers=auth).status_code == 409
+    # remove в том же пакете освобождает место под новые add
+    assert batch(("remove", two), ("add", two), ("add", two)).status_code == 200
+    assert [(p["id"], p["quantity"]) for p in client.get("/cart", headers=auth).json()] == [(two, 2)]
+
+def test_auth(client, main):
+    assert client.get("/cart").status_code == 403
+    auth = login(client)
+    assert client.post("/register", json={"username": "alice", "password": "x"}).status_code == 400
+    assert client.post("/login", json={"username": "alice", "password": "wrong"}).status_code == 400
+    assert client.post("/logout", headers=auth).status_code == 200
+    assert client.get("/cart", headers=auth).status_code == 403
+
+@pytest.mark.parametrize("backend", ["memory", "database", "sqlite"])
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_session_backends(monkeypatch, tmp_path, mode, backend):
+    main = load_main(monkeypatch, tmp_path, mode, backend)
+    with TestClient(main.app) as client:
+        auth = login(client)
+        assert client.get("/cart", headers=auth).status_code == 200
+        assert client.post("/logout", headers=auth).status_code == 200
+        assert client.get("/cart", headers=auth).status_code == 403
@@ -0,0 +1,29 @@
+# migrate.py upgrade: пустая база получает всю схему, старая — недостающие миграции
+import pytest
+from sqlalchemy import create_engine, inspect
+
+import migrate
+
+def tables(url: str) -> set[str]:
+    engine = create_engine(url)
+    try:
+        return set(inspect(engine).get_table_names())
+    finally:
+        engine.dispose()
+
+def test_fresh_database_gets_sessions_table(sync_main):
+    assert {"users", "products", "orders", "sessions", "schema_version"} <= tables(sync_main.DATABASE_URL)
+    assert migrate.upgrade(sync_main.DATABASE_URL) == []
+
+@pytest.mark.parametrize("had_sessions", [False, True])
+def test_upgrade_from_005_creates_sessions(sync_main, had_sessions):
+    # База до миграции 006: без sessions или с таблицей, созданной прежним приложением при запросе
+    engine = create_engine(sync_main.DATABASE_URL)
+    with engine.begin() as conn:
+        if not had_sessions:
+            conn.exec_driver_sql("DROP TABLE sessions")
+    engine.dispose()
+    migrate.stamp(sync_main.DATABASE_URL, 5)
+
+    assert migrate.upgrade(sync_main.DATABASE_URL) == [6]
+    assert "sessions" in tables(sync_main.DATABASE_URL)
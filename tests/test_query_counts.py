@@ -0,0 +1,22 @@
+# Корзина и закладки читаются одним JOIN: число SQL-операторов на запрос (X-DB-Queries)
+# не зависит от числа позиций
+import pytest
+
+from conftest import create_products, login
+
+def queries(response) -> int:
+    assert response.status_code == 200
+    return int(response.headers["X-DB-Queries"])
+
+@pytest.mark.parametrize("path", ["/cart", "/bookmarks"])
+def test_list_queries_do_not_grow_with_items(client, main, path):
+    ids = create_products(client, 25)
+    one, many = login(client, "one"), login(client, "many")
+    client.post(f"{path}/{ids[0]}", headers=one)
+    for product_id in ids:
+        client.post(f"{path}/{product_id}", headers=many)
+
+    small = client.get(path, headers=one)
+    large = client.get(path, headers=many)
+    assert len(small.json()) == 1 and len(large.json()) == 25
+    assert queries(small) == queries(large) == 1
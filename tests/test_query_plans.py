@@ -0,0 +1,49 @@
+# Чтение и удаление позиций корзины и закладок идут по составным индексам (user_id, product_id):
+# EXPLAIN QUERY PLAN каждого оператора, выполненного роутом, без полного SCAN таблицы
+import re
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from conftest import create_products, login
+
+def executed_plans(main, send) -> list[tuple[str, list[str]]]:
+    statements = []
+    record = lambda conn, cursor, statement, parameters, context, executemany: statements.append((statement, parameters))
+    event.listen(main.sync_engine, "before_cursor_execute", record)
+    try:
+        send()
+    finally:
+        event.remove(main.sync_engine, "before_cursor_execute", record)
+    with sqlite3.connect(main.sync_engine.url.database) as conn:
+        return [
+            (statement, [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)])
+            for statement, parameters in statements
+        ]
+
+@pytest.mark.parametrize("method, path, index", [
+    ("get", "/cart", "uq_cart_items_user_product"),
+    ("delete", "/cart/{id}", "uq_cart_items_user_product"),
+    ("get", "/bookmarks", "ix_bookmarks_user_product"),
+    ("delete", "/bookmarks/{id}", "ix_bookmarks_user_product"),
+])
+def test_cart_and_bookmarks_use_user_product_index(sync_main, method, path, index):
+    with TestClient(sync_main.app) as client:
+        auth = login(client)
+        ids = create_products(client, 3)
+        for product_id in ids:
+            client.post(f"/cart/{product_id}", headers=auth)
+            client.post(f"/bookmarks/{product_id}", headers=auth)
+
+        send = lambda: getattr(client, method)(path.format(id=ids[0]), headers=auth)
+        plans = executed_plans(sync_main, send)
+
+    assert plans
+    table = "cart_items" if path.startswith("/cart") else "bookmarks"
+    for statement, plan in plans:
+        assert not any(step.startswith("SCAN") for step in plan), (statement, plan)
+        if re.search(rf"\b{table}\.user_id = \?", statement):
+            assert any(re.search(rf"USING (COVERING )?INDEX {index}\b", step) for step in plan), (statement, plan)
+    assert any(index in step for _, plan in plans for step in plan)